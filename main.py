@@ -1,32 +1,54 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
 import os
+import asyncio
 import logging
-import uuid
-import random
+import secrets
+import threading
+import numpy as np
+from collections import OrderedDict, namedtuple
+from itertools import accumulate
+from sys import intern
 from datetime import datetime
+from contextlib import asynccontextmanager
+from anyio.to_thread import current_default_thread_limiter
+
+try:
+    from numba import njit
+except ImportError:  # sem numba, o kernel roda vetorizado em numpy puro
+    njit = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Handlers síncronos rodam no threadpool do anyio; elevar o limite
+    # padrão (40) para escalar requisições concorrentes
+    current_default_thread_limiter().total_tokens = 64
+    yield
+
 app = FastAPI(
     title="Raspadinha Premiada API",
     description="API para jogo de raspadinha com integração Mercado Pago",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware
+# CORS middleware: listas explícitas deixam o Starlette responder com
+# headers pré-computados em vez de expandir curingas a cada resposta
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Em produção, especificar domínios
+    allow_origins=os.getenv("FRONTEND_ORIGIN", "*").split(","),  # Em produção, definir FRONTEND_ORIGIN
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
 )
 
 # Models
@@ -47,111 +69,260 @@ class PaymentResponse(BaseModel):
     message: str
     ticket_id: Optional[str] = None
 
+# Tamanho do bloco de uniformes pré-sorteados por instância
+_RNG_POOL_SIZE = 4096
+
+# Prêmio imutável: tier e is_winner são função do valor e ficam
+# pré-computados; mensagens internadas são compartilhadas entre pools
+Prize = namedtuple("Prize", "amount probability message tier is_winner")
+
+def _get_prize_tier(amount: float) -> str:
+    """Determina o tier do prêmio baseado no valor"""
+    if amount >= 1000:
+        return "jackpot"
+    elif amount >= 100:
+        return "major"
+    elif amount >= 10:
+        return "minor"
+    elif amount > 0:
+        return "consolation"
+    else:
+        return "none"
+
+def _make_prize(amount: float, probability: float, message: str) -> Prize:
+    return Prize(amount, probability, intern(message), _get_prize_tier(amount), amount > 0)
+
+# Kernel de simulação em massa: laço apertado de searchsorted sobre a
+# CDF, compilado com numba quando disponível
+def _simulate_draws(cdf: np.ndarray, n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.searchsorted(cdf, rng.random(n)).astype(np.int64)
+
+if njit is not None:
+    @njit(cache=True)
+    def _simulate_draws(cdf, n, seed):  # noqa: F811
+        np.random.seed(seed)
+        out = np.empty(n, np.int64)
+        for i in range(n):
+            out[i] = np.searchsorted(cdf, np.random.random())
+        return out
+
 # Simulador de sistema de prêmios
 class PrizeSystem:
+    __slots__ = ("_rng", "_pool", "_pos", "prize_pools", "_cdf",
+                 "_templates", "_cdf_np", "_alias")
+
     def __init__(self):
+        self._rng = np.random.default_rng()
+        self._pool = self._rng.random(_RNG_POOL_SIZE)
+        self._pos = 0
         self.prize_pools = {
-            5: [
-                {"amount": 0, "probability": 0.75, "message": "Tente novamente!"},
-                {"amount": 5, "probability": 0.15, "message": "Recuperou o valor!"},
-                {"amount": 15, "probability": 0.08, "message": "Triplicou!"},
-                {"amount": 50, "probability": 0.019, "message": "Grande prêmio!"},
-                {"amount": 250, "probability": 0.001, "message": "JACKPOT!"}
-            ],
-            10: [
-                {"amount": 0, "probability": 0.70, "message": "Tente novamente!"},
-                {"amount": 10, "probability": 0.18, "message": "Recuperou o valor!"},
-                {"amount": 30, "probability": 0.10, "message": "Triplicou!"},
-                {"amount": 100, "probability": 0.019, "message": "Grande prêmio!"},
-                {"amount": 500, "probability": 0.001, "message": "JACKPOT!"}
-            ],
-            25: [
-                {"amount": 0, "probability": 0.65, "message": "Tente novamente!"},
-                {"amount": 25, "probability": 0.20, "message": "Recuperou o valor!"},
-                {"amount": 75, "probability": 0.12, "message": "Triplicou!"},
-                {"amount": 250, "probability": 0.029, "message": "Grande prêmio!"},
-                {"amount": 1000, "probability": 0.001, "message": "JACKPOT!"}
-            ],
-            50: [
-                {"amount": 0, "probability": 0.60, "message": "Tente novamente!"},
-                {"amount": 50, "probability": 0.22, "message": "Recuperou o valor!"},
-                {"amount": 150, "probability": 0.15, "message": "Triplicou!"},
-                {"amount": 500, "probability": 0.029, "message": "Grande prêmio!"},
-                {"amount": 2500, "probability": 0.001, "message": "JACKPOT!"}
-            ]
+            5: (
+                _make_prize(0, 0.75, "Tente novamente!"),
+                _make_prize(5, 0.15, "Recuperou o valor!"),
+                _make_prize(15, 0.08, "Triplicou!"),
+                _make_prize(50, 0.019, "Grande prêmio!"),
+                _make_prize(250, 0.001, "JACKPOT!")
+            ),
+            10: (
+                _make_prize(0, 0.70, "Tente novamente!"),
+                _make_prize(10, 0.18, "Recuperou o valor!"),
+                _make_prize(30, 0.10, "Triplicou!"),
+                _make_prize(100, 0.019, "Grande prêmio!"),
+                _make_prize(500, 0.001, "JACKPOT!")
+            ),
+            25: (
+                _make_prize(0, 0.65, "Tente novamente!"),
+                _make_prize(25, 0.20, "Recuperou o valor!"),
+                _make_prize(75, 0.12, "Triplicou!"),
+                _make_prize(250, 0.029, "Grande prêmio!"),
+                _make_prize(1000, 0.001, "JACKPOT!")
+            ),
+            50: (
+                _make_prize(0, 0.60, "Tente novamente!"),
+                _make_prize(50, 0.22, "Recuperou o valor!"),
+                _make_prize(150, 0.15, "Triplicou!"),
+                _make_prize(500, 0.029, "Grande prêmio!"),
+                _make_prize(2500, 0.001, "JACKPOT!")
+            )
         }
-    
-    def generate_prize(self, ticket_price: float) -> Dict[str, Any]:
-        """Gera um prêmio baseado no preço do bilhete e probabilidades"""
-        prizes = self.prize_pools.get(ticket_price, self.prize_pools[5])
-        
-        # Gerar número aleatório
-        random_value = random.random()
-        cumulative_probability = 0.0
-        
-        # Selecionar prêmio baseado na probabilidade
-        for prize in prizes:
-            cumulative_probability += prize["probability"]
-            if random_value <= cumulative_probability:
-                return {
-                    "amount": prize["amount"],
-                    "message": prize["message"],
-                    "is_winner": prize["amount"] > 0,
-                    "prize_tier": self._get_prize_tier(prize["amount"]),
-                    "timestamp": datetime.now().isoformat()
+
+        # Pré-computar a CDF de cada pool para amostragem por CDF inversa
+        self._cdf = {
+            price: tuple(accumulate(p.probability for p in prizes))
+            for price, prizes in self.prize_pools.items()
+        }
+
+        # Pré-computar a parte estática de cada resultado; só o timestamp
+        # muda entre chamadas
+        self._templates = {
+            price: tuple(
+                {
+                    "amount": p.amount,
+                    "message": p.message,
+                    "is_winner": p.is_winner,
+                    "prize_tier": p.tier
                 }
-        
-        # Fallback (não deveria acontecer com probabilidades corretas)
+                for p in prizes
+            )
+            for price, prizes in self.prize_pools.items()
+        }
+
+        # Versão NumPy das CDFs para amostragem vetorizada em lote
+        self._cdf_np = {
+            price: np.asarray(cdf, dtype=np.float64)
+            for price, cdf in self._cdf.items()
+        }
+
+        # Tabela de alias (Walker/Vose) por preço: amostragem O(1) no
+        # caminho quente de generate_prize
+        self._alias = {
+            price: self._build_alias_table([p.probability for p in prizes])
+            for price, prizes in self.prize_pools.items()
+        }
+
+        # Aquecer o kernel de simulação (compila uma vez por assinatura)
+        if njit is not None:
+            for cdf in self._cdf_np.values():
+                _simulate_draws(cdf, 1, 0)
+
+    @staticmethod
+    def _build_alias_table(probabilities: list) -> tuple:
+        """Constrói as tabelas prob/alias pelo algoritmo de Vose"""
+        k = len(probabilities)
+        prob = [0.0] * k
+        alias = [0] * k
+        scaled = [p * k for p in probabilities]
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        for i in large:
+            prob[i] = 1.0
+        for i in small:  # resíduo de ponto flutuante
+            prob[i] = 1.0
+
+        return tuple(prob), tuple(alias)
+
+    def _draw(self) -> float:
+        """Retorna um uniforme [0,1) do pool pré-sorteado, reabastecendo em bloco"""
+        if self._pos >= _RNG_POOL_SIZE:
+            self._pool = self._rng.random(_RNG_POOL_SIZE)
+            self._pos = 0
+        value = self._pool[self._pos]
+        self._pos += 1
+        return value
+
+    def generate_prize(self, ticket_price: float, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Gera um prêmio baseado no preço do bilhete e probabilidades"""
+        price = ticket_price if ticket_price in self._alias else 5
+        prob, alias = self._alias[price]
+
+        # Amostragem O(1) pela tabela de alias: um sorteio de coluna e
+        # um teste contra a probabilidade residual
+        idx = int(self._draw() * len(prob))
+        if self._draw() >= prob[idx]:
+            idx = alias[idx]
+
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        return {**self._templates[price][idx], "timestamp": timestamp}
+
+    def generate_prizes(self, ticket_price: float, n: int) -> list:
+        """Gera n prêmios de uma vez via CDF inversa vetorizada (searchsorted)"""
+        price = ticket_price if ticket_price in self._cdf_np else 5
+        cdf = self._cdf_np[price]
+        templates = self._templates[price]
+
+        r = self._rng.random(n)
+        idx = np.searchsorted(cdf, r, side='left')
+        np.clip(idx, 0, len(cdf) - 1, out=idx)
+
+        timestamp = datetime.now().isoformat()
+        return [{**templates[i], "timestamp": timestamp} for i in idx.tolist()]
+
+    def simulate(self, ticket_price: float, n: int, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Simula n sorteios e retorna contagens agregadas por prêmio"""
+        price = ticket_price if ticket_price in self._cdf_np else 5
+        cdf = self._cdf_np[price]
+        prizes = self.prize_pools[price]
+
+        if seed is None:
+            # simulate roda no threadpool; _draw não é thread-safe, então
+            # a semente vem de uma fonte própria
+            seed = secrets.randbits(31)
+        idx = _simulate_draws(cdf, n, seed)
+        np.clip(idx, 0, len(cdf) - 1, out=idx)
+        counts = np.bincount(idx, minlength=len(cdf))
+
+        total_paid = float(sum(p.amount * c for p, c in zip(prizes, counts)))
         return {
-            "amount": 0,
-            "message": "Tente novamente!",
-            "is_winner": False,
-            "prize_tier": "none",
-            "timestamp": datetime.now().isoformat()
+            "ticket_price": price,
+            "draws": n,
+            "results": [
+                {"amount": p.amount, "count": int(c)}
+                for p, c in zip(prizes, counts)
+            ],
+            "total_collected": price * n,
+            "total_paid": total_paid
         }
-    
-    def _get_prize_tier(self, amount: float) -> str:
-        """Determina o tier do prêmio baseado no valor"""
-        if amount >= 1000:
-            return "jackpot"
-        elif amount >= 100:
-            return "major"
-        elif amount >= 10:
-            return "minor"
-        elif amount > 0:
-            return "consolation"
-        else:
-            return "none"
+
+# Cenários de falha do Mercado Pago: (status, status_detail, message),
+# imutáveis e construídos uma única vez
+_FAILURE_SCENARIOS = (
+    ("rejected", "cc_rejected_insufficient_amount", "Saldo insuficiente"),
+    ("rejected", "cc_rejected_bad_filled_security_code", "Código de segurança inválido"),
+    ("pending", "pending_waiting_payment", "Aguardando pagamento"),
+    ("rejected", "cc_rejected_call_for_authorize", "Pagamento não autorizado")
+)
 
 # Simulador do Mercado Pago
 class MercadoPagoSimulator:
+    __slots__ = ("transactions", "_rng", "_pool", "_pos")
+
     def __init__(self):
-        self.transactions = {}
-    
+        self.transactions = BoundedDict(100_000)
+        self._rng = np.random.default_rng()
+        self._pool = self._rng.random(_RNG_POOL_SIZE)
+        self._pos = 0
+
+    def _draw(self) -> float:
+        """Retorna um uniforme [0,1) do pool pré-sorteado, reabastecendo em bloco"""
+        if self._pos >= _RNG_POOL_SIZE:
+            self._pool = self._rng.random(_RNG_POOL_SIZE)
+            self._pos = 0
+        value = self._pool[self._pos]
+        self._pos += 1
+        return value
+
     def process_payment(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Simula processamento de pagamento no Mercado Pago"""
-        payment_id = f"mp_payment_{uuid.uuid4().hex[:10]}"
+        payment_id = f"mp_payment_{secrets.token_hex(5)}"
+        now = datetime.now().isoformat()
         
         # Simular diferentes cenários de pagamento
         success_rate = 0.85  # 85% de sucesso
         
-        if random.random() < success_rate:
+        if self._draw() < success_rate:
             status = "approved"
             status_detail = "accredited"
             message = "Pagamento aprovado com sucesso"
         else:
             # Simular falhas comuns
-            failure_scenarios = [
-                {"status": "rejected", "detail": "cc_rejected_insufficient_amount", "message": "Saldo insuficiente"},
-                {"status": "rejected", "detail": "cc_rejected_bad_filled_security_code", "message": "Código de segurança inválido"},
-                {"status": "pending", "detail": "pending_waiting_payment", "message": "Aguardando pagamento"},
-                {"status": "rejected", "detail": "cc_rejected_call_for_authorize", "message": "Pagamento não autorizado"}
+            status, status_detail, message = _FAILURE_SCENARIOS[
+                int(self._draw() * len(_FAILURE_SCENARIOS))
             ]
-            
-            scenario = random.choice(failure_scenarios)
-            status = scenario["status"]
-            status_detail = scenario["detail"]
-            message = scenario["message"]
         
         # Armazenar transação
         transaction = {
@@ -160,8 +331,8 @@ class MercadoPagoSimulator:
             "status_detail": status_detail,
             "transaction_amount": payment_data.get("amount", 0),
             "payment_method_id": payment_data.get("payment_method", "unknown"),
-            "date_created": datetime.now().isoformat(),
-            "date_approved": datetime.now().isoformat() if status == "approved" else None,
+            "date_created": now,
+            "date_approved": now if status == "approved" else None,
             "payer": payment_data.get("payer", {}),
             "metadata": payment_data.get("metadata", {})
         }
@@ -176,24 +347,137 @@ class MercadoPagoSimulator:
             "transaction_amount": payment_data.get("amount", 0)
         }
     
+    def process_batch(self, batch: list) -> list:
+        """Processa um lote de pagamentos numa única passada.
+
+        Com o simulador em processo isso só evita o overhead por chamada;
+        com um backend real do Mercado Pago vira uma única requisição bulk.
+        """
+        return [self.process_payment(payment_data) for payment_data in batch]
+
     def get_payment(self, payment_id: str) -> Optional[Dict[str, Any]]:
         """Recupera informações de um pagamento"""
         return self.transactions.get(payment_id)
 
+# Coletor de lotes: agrupa pagamentos chegando dentro de uma janela
+# curta e despacha uma única chamada ao backend, resolvendo cada
+# requisição via future. Com max_delay=0 (padrão) o despacho é imediato;
+# uma janela só compensa quando o backend faz chamadas de rede em bulk
+class PaymentBatcher:
+    def __init__(self, backend, max_batch_size: int = 32, max_delay: float = 0.0):
+        self._backend = backend
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._queue = []
+        self._flush_handle = None
+
+    async def submit(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enfileira um pagamento e aguarda o resultado do lote"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((payment_data, future))
+        if self._max_delay <= 0 or len(self._queue) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+        try:
+            results = self._backend.process_batch([payment for payment, _ in batch])
+        except Exception as e:
+            # Propagar a falha para todas as requisições do lote em vez
+            # de deixá-las aguardando um future que nunca resolve
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+# Dict com teto de tamanho: ao exceder maxsize descarta a entrada mais
+# antiga, mantendo o working set limitado (em produção, usar Redis com TTL)
+class BoundedDict(OrderedDict):
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+# Armazenamento de bilhetes em memória com agregados incrementais.
+# Os registros são limitados em maxsize (evicção FIFO); os agregados de
+# /api/statistics sobrevivem à evicção porque são contadores correntes,
+# e o número de bilhetes emitidos é rastreado à parte
+class TicketStore:
+    def __init__(self, maxsize: int = 100_000):
+        self._records = BoundedDict(maxsize)
+        # Handlers síncronos rodam em threads do pool do anyio; o lock
+        # protege o test-and-set de raspagem e os += dos agregados
+        self._lock = threading.Lock()
+        # Agregados mantidos incrementalmente nos dois pontos de escrita;
+        # /api/statistics vira uma leitura O(1)
+        self.total_tickets = 0
+        self.total_payments = 0.0
+        self.total_prizes = 0.0
+        self.winners_count = 0
+
+    def add(self, ticket: Dict[str, Any]) -> None:
+        """Insere um bilhete e atualiza os agregados"""
+        with self._lock:
+            self._records[ticket["id"]] = ticket
+            self.total_tickets += 1
+            self.total_payments += ticket["price"]
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(ticket_id)
+
+    def mark_scratched(self, ticket_id: str, scratched_at: str) -> bool:
+        """Marca o bilhete como raspado (atômico); False se já raspado"""
+        with self._lock:
+            ticket = self._records.get(ticket_id)
+            if ticket is None or ticket["scratched"]:
+                return False
+            ticket["scratched"] = True
+            ticket["scratched_at"] = scratched_at
+            amount = ticket["prize"]["amount"]
+            self.total_prizes += amount
+            if amount > 0:
+                self.winners_count += 1
+            return True
+
+    def __len__(self) -> int:
+        return len(self._records)
+
 # Instanciar sistemas
 prize_system = PrizeSystem()
 mp_simulator = MercadoPagoSimulator()
+# Com um backend real do Mercado Pago, passar max_delay=0.05 para
+# agrupar as chamadas de rede
+payment_batcher = PaymentBatcher(mp_simulator)
+
+# Preços de bilhete aceitos (os mesmos dos prize_pools)
+_VALID_PRICES = frozenset(prize_system.prize_pools)
 
 # Armazenamento em memória (em produção, usar banco de dados)
-tickets_db = {}
-payments_db = {}
+tickets_db = TicketStore()
+payments_db = BoundedDict(100_000)
 
 @app.get("/")
-async def root():
+def root():
     return {"message": "Raspadinha Premiada API está funcionando!"}
 
 @app.get("/api/")
-async def api_root():
+def api_root():
     return {
         "message": "API da Raspadinha Premiada",
         "version": "1.0.0",
@@ -204,11 +488,11 @@ async def api_root():
 async def process_payment(payment_request: PaymentRequest):
     """Processa pagamento e gera bilhete"""
     try:
-        logger.info(f"Processando pagamento: R$ {payment_request.amount}")
-        
+        logger.info("Processando pagamento: R$ %s", payment_request.amount)
+        now = datetime.now().isoformat()
+
         # Validar preço do bilhete
-        valid_prices = [5, 10, 25, 50]
-        if payment_request.amount not in valid_prices:
+        if payment_request.amount not in _VALID_PRICES:
             raise HTTPException(status_code=400, detail="Preço de bilhete inválido")
         
         # Simular processamento no Mercado Pago
@@ -219,35 +503,37 @@ async def process_payment(payment_request: PaymentRequest):
             "metadata": {"game_type": "scratch_lottery"}
         }
         
-        mp_result = mp_simulator.process_payment(mp_payment_data)
+        mp_result = await payment_batcher.submit(mp_payment_data)
         
         # Salvar pagamento
         payments_db[mp_result["id"]] = {
             "payment_id": mp_result["id"],
             "amount": payment_request.amount,
             "status": mp_result["status"],
-            "created_at": datetime.now().isoformat()
+            "created_at": now
         }
         
         if mp_result["status"] == "approved":
             # Gerar bilhete e prêmio
-            ticket_id = f"ticket_{uuid.uuid4().hex[:8]}"
-            prize = prize_system.generate_prize(payment_request.amount)
-            
+            ticket_id = f"ticket_{secrets.token_hex(4)}"
+            prize = prize_system.generate_prize(payment_request.amount, timestamp=now)
+
             ticket = {
                 "id": ticket_id,
                 "payment_id": mp_result["id"],
                 "price": payment_request.amount,
                 "prize": prize,
-                "created_at": datetime.now().isoformat(),
+                "created_at": now,
                 "scratched": False
             }
             
-            tickets_db[ticket_id] = ticket
+            tickets_db.add(ticket)
             
-            logger.info(f"Bilhete gerado: {ticket_id} - Prêmio: R$ {prize['amount']}")
+            logger.info("Bilhete gerado: %s - Prêmio: R$ %s", ticket_id, prize["amount"])
             
-            return PaymentResponse(
+            # model_construct pula a validação: os campos são conhecidos
+            # e tipados por nós
+            return PaymentResponse.model_construct(
                 success=True,
                 payment_id=mp_result["id"],
                 status="approved",
@@ -256,7 +542,7 @@ async def process_payment(payment_request: PaymentRequest):
             )
         else:
             # Pagamento não aprovado
-            return PaymentResponse(
+            return PaymentResponse.model_construct(
                 success=False,
                 payment_id=mp_result["id"],
                 status=mp_result["status"],
@@ -265,11 +551,11 @@ async def process_payment(payment_request: PaymentRequest):
             )
     
     except Exception as e:
-        logger.error(f"Erro no processamento: {str(e)}")
+        logger.error("Erro no processamento: %s", e)
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 @app.get("/api/ticket/{ticket_id}")
-async def get_ticket(ticket_id: str):
+def get_ticket(ticket_id: str):
     """Recupera informações de um bilhete"""
     ticket = tickets_db.get(ticket_id)
     if not ticket:
@@ -278,20 +564,17 @@ async def get_ticket(ticket_id: str):
     return ticket
 
 @app.post("/api/scratch-ticket/{ticket_id}")
-async def scratch_ticket(ticket_id: str):
+def scratch_ticket(ticket_id: str):
     """Marca bilhete como raspado e revela prêmio"""
     ticket = tickets_db.get(ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Bilhete não encontrado")
-    
-    if ticket["scratched"]:
+
+    # Test-and-set atômico: só a primeira raspagem concorrente vence
+    if not tickets_db.mark_scratched(ticket_id, datetime.now().isoformat()):
         raise HTTPException(status_code=400, detail="Bilhete já foi raspado")
-    
-    # Marcar como raspado
-    tickets_db[ticket_id]["scratched"] = True
-    tickets_db[ticket_id]["scratched_at"] = datetime.now().isoformat()
-    
-    logger.info(f"Bilhete raspado: {ticket_id} - Prêmio: R$ {ticket['prize']['amount']}")
+
+    logger.info("Bilhete raspado: %s - Prêmio: R$ %s", ticket_id, ticket["prize"]["amount"])
     
     return {
         "ticket_id": ticket_id,
@@ -299,25 +582,33 @@ async def scratch_ticket(ticket_id: str):
         "message": "Bilhete raspado com sucesso!"
     }
 
+@app.get("/api/simulate")
+def simulate(ticket_price: float = 5, n: int = 100_000, seed: Optional[int] = None):
+    """Simula sorteios em massa para conferir as probabilidades dos pools"""
+    if n < 1 or n > 10_000_000:
+        raise HTTPException(status_code=400, detail="n deve estar entre 1 e 10000000")
+
+    return prize_system.simulate(ticket_price, n, seed)
+
 @app.get("/api/statistics")
-async def get_statistics():
+def get_statistics():
     """Retorna estatísticas do jogo"""
-    total_tickets = len(tickets_db)
-    total_payments = sum(t["price"] for t in tickets_db.values())
-    total_prizes = sum(t["prize"]["amount"] for t in tickets_db.values() if t["scratched"])
-    winners = [t for t in tickets_db.values() if t["scratched"] and t["prize"]["amount"] > 0]
-    
+    total_tickets = tickets_db.total_tickets
+    total_payments = tickets_db.total_payments
+    total_prizes = tickets_db.total_prizes
+    winners_count = tickets_db.winners_count
+
     return {
         "total_tickets": total_tickets,
         "total_payments": total_payments,
         "total_prizes": total_prizes,
-        "winners_count": len(winners),
-        "win_rate": len(winners) / total_tickets if total_tickets > 0 else 0,
+        "winners_count": winners_count,
+        "win_rate": winners_count / total_tickets if total_tickets > 0 else 0,
         "house_edge": (total_payments - total_prizes) / total_payments if total_payments > 0 else 0
     }
 
 @app.get("/api/health")
-async def health_check():
+def health_check():
     """Endpoint de health check"""
     return {
         "status": "healthy",
@@ -328,4 +619,14 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # WEB_CONCURRENCY > 1 exige estado externalizado (Redis) porque os
+    # stores em memória não são compartilhados entre workers
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        backlog=2048
+    )
\ No newline at end of file